@@ -1,6 +1,56 @@
 import time
+import random
+import threading
+import orjson
 import requests
+from collections import deque
+from requests.adapters import HTTPAdapter
 from typing import Dict
+from urllib.parse import urlparse
+
+
+class RateLimiter:
+    """
+    Thread-safe sliding-window rate limiter.
+
+    Allows at most `max_calls` acquisitions within any rolling window of
+    `period_seconds`. Callers that would exceed the limit block until the
+    oldest call leaves the window.
+
+    A sliding window (instead of a token bucket) is used on purpose: the
+    OpenWeather limit is a plain "calls per minute" quota, so a full burst is
+    allowed as long as the rolling count never goes over the quota.
+    """
+
+    def __init__(self, max_calls: int, period_seconds: float = 60.0):
+        """
+        Args:
+            max_calls: Maximum number of calls allowed per window.
+            period_seconds: Window length in seconds.
+        """
+        self.max_calls = max_calls
+        self.period_seconds = period_seconds
+        self.calls = deque()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a call is allowed, then record it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+
+                # Forget calls that already left the window
+                while self.calls and now - self.calls[0] >= self.period_seconds:
+                    self.calls.popleft()
+
+                if len(self.calls) < self.max_calls:
+                    self.calls.append(now)
+                    return
+
+                wait = self.period_seconds - (now - self.calls[0])
+
+            # Sleep outside the lock so other threads can check the window
+            time.sleep(wait)
 
 
 class OpenWeatherClient:
@@ -9,7 +59,7 @@ class OpenWeatherClient:
 
     This client implements:
         - request retries
-        - fixed backoff between attempts
+        - exponential backoff with jitter between attempts (Retry-After aware)
         - timeout handling
         - API error propagation
 
@@ -19,8 +69,14 @@ class OpenWeatherClient:
         - short API outages
         - DNS issues
 
-    The client is intentionally stateless so it can be reused across
-    multiple cities inside a single pipeline execution.
+    A single `requests.Session` is kept for the lifetime of the client so the
+    HTTPS connection to OpenWeather is reused (keep-alive) across cities instead
+    of paying a new TCP + TLS handshake per request. Call `close()` once the
+    pipeline is done to release the pooled connections.
+
+    The client is thread-safe: `fetch_weather` can be called concurrently from
+    a thread pool, with up to `max_concurrent` pooled connections and all
+    requests throttled by a shared `RateLimiter`.
     """
 
     def __init__(
@@ -31,6 +87,9 @@ class OpenWeatherClient:
         timeout: int,
         max_retries: int,
         backoff_seconds: int,
+        max_backoff_seconds: int,
+        max_concurrent: int,
+        max_calls_per_minute: int,
         logger
     ):
         """
@@ -42,7 +101,10 @@ class OpenWeatherClient:
             units: Measurement units (metric, imperial, default).
             timeout: HTTP timeout in seconds.
             max_retries: Maximum retry attempts per request.
-            backoff_seconds: Sleep duration between retries.
+            backoff_seconds: Base sleep duration between retries, doubled on every attempt.
+            max_backoff_seconds: Upper bound of the exponential backoff (jitter is added on top).
+            max_concurrent: Maximum number of pooled connections (one per worker thread).
+            max_calls_per_minute: API quota, shared by all concurrent requests.
             logger: Preconfigured application logger.
 
         Notes:
@@ -55,7 +117,22 @@ class OpenWeatherClient:
         self.timeout = timeout
         self.max_retries = max_retries
         self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
         self.logger = logger
+        self.rate_limiter = RateLimiter(max_calls_per_minute, 60)
+
+        # Retries are handled by fetch_weather, so the adapter must not retry on its own
+        self.session = requests.Session()
+        self.session.mount(
+            f"{urlparse(base_url).scheme}://",
+            HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrent, max_retries=0)
+        )
+
+        # Static query parameters are sent on every request, only "q" varies per city
+        self.session.params = {
+            "appid": self.api_key,
+            "units": self.units
+        }
 
     def fetch_weather(self, city: str, country: str) -> Dict:
         """
@@ -76,24 +153,24 @@ class OpenWeatherClient:
             RuntimeError: If all retry attempts fail.
 
         Retry Strategy:
-            Fixed backoff (simple + predictable)
+            Exponential backoff with jitter, capped (see `_retry_delay`)
+            Retry-After header honored on 429 responses
             Attempt count controlled by config
             Fail fast after final attempt
         """
         # OpenWeather expects "City,CountryCode"
         query = f"{city},{country}"
 
-        params = {
-            "q": query,
-            "appid": self.api_key,
-            "units": self.units
-        }
+        params = {"q": query}
 
         # Retry loop — protects pipeline reliability
         for attempt in range(1, self.max_retries + 1):
             try:
+                # Every attempt counts against the API quota, retries included
+                self.rate_limiter.acquire()
+
                 # External network call (primary failure point)
-                response = requests.get(
+                response = self.session.get(
                     self.base_url,
                     params=params,
                     timeout=self.timeout
@@ -102,49 +179,103 @@ class OpenWeatherClient:
                 # Raises HTTPError for 4xx/5xx
                 response.raise_for_status()
 
-                # Success path
-                return response.json()
+                # Success path, orjson decodes the raw bytes much faster than the stdlib json used by response.json()
+                return orjson.loads(response.content)
 
-            except requests.RequestException as e:
+            except (requests.RequestException, orjson.JSONDecodeError) as e:
                 # Includes:
                 # - Timeout
                 # - DNS failure
                 # - Connection error
                 # - HTTP error status
+                # - Truncated/invalid JSON body
                 self.logger.warning(
                     f"Attempt {attempt}/{self.max_retries} failed for {query}: {e}"
                 )
 
                 # Do not sleep after final attempt
                 if attempt < self.max_retries:
-                    time.sleep(self.backoff_seconds)
+                    time.sleep(self._retry_delay(attempt, e))
 
         # After exhausting retries we fail the city, not silently ignore it
         raise RuntimeError(f"Failed to fetch data for {query}")
 
-    def get_field(self, d, *keys, default=None):
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        """
+        Return how many seconds to wait before the next attempt.
+
+        Backoff doubles on every attempt (backoff_seconds * 2^(attempt - 1)) up to
+        max_backoff_seconds, then random jitter (up to backoff_seconds) is added on
+        top so cities that failed together do not retry in lockstep, even once the
+        cap is reached. On 429 (rate limited) a `Retry-After` header takes
+        precedence, since the server knows when the quota resets; it is clamped
+        to [0, max_backoff_seconds] so a misbehaving response cannot stall the run.
+
+        Args:
+            attempt: Attempt number that just failed (starts at 1).
+            error: Exception raised by that attempt.
+
+        Returns:
+            Delay in seconds.
+        """
+        # Cap first, jitter after: jitter added before the cap would be cut off and every retry would sleep exactly the cap
+        delay = min(self.backoff_seconds * 2 ** (attempt - 1), self.max_backoff_seconds) + random.uniform(0, self.backoff_seconds)
+
+        # Only HTTP errors carry a response (JSON decode errors, timeouts, DNS failures don't)
+        response = getattr(error, "response", None)
+        if response is not None and response.status_code == 429:
+            try:
+                # Clamped: a negative value would make time.sleep raise, a huge one (or inf) would park the worker
+                delay = min(max(0.0, float(response.headers.get("Retry-After", delay))), self.max_backoff_seconds)
+            except ValueError:
+                # Retry-After in HTTP-date form is not supported, keep the computed backoff
+                pass
+
+        return delay
+
+    def close(self) -> None:
         """
-        Safely extract nested dictionary values from API responses.
+        Close the underlying HTTP session and its pooled connections.
 
-        Avoids repetitive defensive checks when parsing JSON payloads.
+        Should be called once, after the last request of the pipeline run.
+        """
+        self.session.close()
+
+    @staticmethod
+    def extract_fields(raw: Dict) -> Dict:
+        """
+        Flatten a Current Weather API response into WeatherRecord fields.
 
-        Example:
-            get_field(raw, "main", "temp")
-            get_field(raw, "weather", 0, "description")
+        Specialized for the fixed OpenWeather schema: each nested object is
+        looked up once and every field is a direct `.get`, instead of walking
+        a generic key path per field. Missing objects or fields default to None.
 
         Args:
-            d: Source dictionary.
-            *keys: Path of nested keys/indexes.
-            default: Value returned if any level is missing.
+            raw: Parsed JSON response from `fetch_weather`.
 
         Returns:
-            Extracted value or default.
+            Dict keyed by WeatherRecord field name (raw values, no conversion).
         """
-        for key in keys:
-            if isinstance(d, dict) and key in d:
-                d = d[key]
-            elif isinstance(d, list) and isinstance(key, int) and 0 <= key < len(d):
-                d = d[key]
-            else:
-                return default
-        return d
\ No newline at end of file
+        main    = raw.get("main") or {}
+        wind    = raw.get("wind") or {}
+        sun     = raw.get("sys") or {}
+        clouds  = raw.get("clouds") or {}
+        weather = (raw.get("weather") or [{}])[0]
+
+        return {
+            "timestamp":              raw.get("dt"),
+            "timezone_offset":        raw.get("timezone"),
+            "weather":                weather.get("main"),
+            "weather_description":    weather.get("description"),
+            "temperature_min":        main.get("temp_min"),
+            "temperature_max":        main.get("temp_max"),
+            "temperature_current":    main.get("temp"),
+            "temperature_feels_like": main.get("feels_like"),
+            "cloudiness":             clouds.get("all"),
+            "wind_speed":             wind.get("speed"),
+            "wind_direction_deg":     wind.get("deg"),
+            "humidity":               main.get("humidity"),
+            "pressure":               main.get("pressure"),
+            "sunrise":                sun.get("sunrise"),
+            "sunset":                 sun.get("sunset"),
+        }
@@ -1,8 +1,14 @@
-import json
+import os
+import ijson
 import yaml
+import pickle
+import hashlib
 import unicodedata
 from pathlib import Path
-from typing import Dict, Set, Tuple
+from typing import Dict, Optional, Set, Tuple
+
+# Bump whenever the content of the cached set changes (e.g. normalization rules), so stale caches are ignored
+_CITY_CACHE_VERSION = 1
 
 
 class ConfigLoader:
@@ -13,18 +19,22 @@ class ConfigLoader:
         - Load YAML configuration.
         - Load OpenWeather `city.list.json` and build a normalized set for validation.
         - Provide a method to validate if a city exists in OpenWeather dataset.
+        - Cache the normalized set on disk, so the city list is only parsed again when it changes.
     """
 
-    def __init__(self, config_path: str, city_list_path: str):
+    def __init__(self, config_path: str, city_list_path: str, cache_dir: Optional[str] = None):
         """
         Initialize the ConfigLoader.
 
         Args:
             config_path (str): Path to the YAML configuration file.
             city_list_path (str): Path to the OpenWeather city list JSON file.
+            cache_dir (str, optional): Folder for the cached city set.
+                Defaults to `$XDG_CACHE_HOME/weather_pipeline` (or `~/.cache/weather_pipeline`).
         """
         self.config_path      = Path(config_path)
         self.city_list_path   = Path(city_list_path)
+        self.cache_dir        = Path(cache_dir) if cache_dir else Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "weather_pipeline"
         self.config           = None
         self.valid_cities_set = None
 
@@ -64,6 +74,11 @@ class ConfigLoader:
         Returns:
             str: Normalized city name.
         """
+        # Most names are already plain ASCII (~80% of city.list.json): nothing to decompose, skip straight to strip/lower.
+        # str.isascii() is O(1), CPython tracks it on the string object
+        if name.isascii():
+            return name.strip().lower()
+
         return (
             unicodedata.normalize("NFKD", name)
             .encode("ASCII", "ignore")
@@ -72,6 +87,17 @@ class ConfigLoader:
             .lower()
         )
 
+    def _cache_file(self) -> Path:
+        """
+        Return the cache file path for the current city list.
+
+        The name is derived from the list's path, size and modification time,
+        so any change to `city.list.json` automatically misses the old cache.
+        """
+        stat = self.city_list_path.stat()
+        key = f"{self.city_list_path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}:{_CITY_CACHE_VERSION}"
+        return self.cache_dir / f"cities-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]}.pkl"
+
     def load_valid_cities(self) -> Set[Tuple[str, str]]:
         """
         Load OpenWeather city list and build a set for validation.
@@ -79,23 +105,48 @@ class ConfigLoader:
         Each entry in the set is a tuple:
             (normalized_city_name, ISO_country_code)
 
+        The set is cached on disk (pickle) after the first build, later runs
+        load it directly as long as `city.list.json` is unchanged.
+
         Returns:
             set[tuple[str, str]]: Set of valid city-country tuples.
 
         Raises:
             FileNotFoundError: If the JSON city list does not exist.
-            json.JSONDecodeError: If the JSON is invalid.
+            ijson.JSONError: If the JSON is invalid.
         """
         if not self.city_list_path.exists():
             raise FileNotFoundError(f"City list not found: {self.city_list_path}")
 
-        with open(self.city_list_path, "r", encoding="utf-8") as f:
-            city_list = json.load(f)
-
-        self.valid_cities_set = {
-            (self.normalize_city(c["name"]), c["country"].upper())
-            for c in city_list
-        }
+        cache_file = self._cache_file()
+
+        # A missing or unreadable cache is not an error, the set is simply rebuilt below
+        try:
+            with open(cache_file, "rb") as f:
+                self.valid_cities_set = pickle.load(f)
+            return self.valid_cities_set
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+
+        # Stream the ~40 MB list one city at a time instead of materializing it whole.
+        # Only name and country are kept, so peak memory stays a fraction of a full json.load.
+        # use_float: coordinates are never used, parsing them as float avoids building a Decimal for each one
+        with open(self.city_list_path, "rb") as f:
+            self.valid_cities_set = {
+                (self.normalize_city(c["name"]), c["country"].upper())
+                for c in ijson.items(f, "item", use_float=True)
+            }
+
+        # Write to a temporary file first so a concurrent or interrupted run never sees a partial cache.
+        # Failing to write (e.g. read-only filesystem) only costs the speedup on the next run
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, "wb") as f:
+                pickle.dump(self.valid_cities_set, f, protocol=5)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass
 
         return self.valid_cities_set
 
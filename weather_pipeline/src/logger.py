@@ -1,5 +1,15 @@
 import logging
 import sys
+from typing import Dict
+
+# Format intentionally simple, parse this reliably without custom rules. Built once and shared by every handler
+_FORMATTER = logging.Formatter(
+    fmt="%(asctime)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S"
+)
+
+# Loggers already configured by setup_logger, by name
+_LOGGERS: Dict[str, logging.Logger] = {}
 
 
 def setup_logger(name: str = "weather_pipeline") -> logging.Logger:
@@ -12,6 +22,8 @@ def setup_logger(name: str = "weather_pipeline") -> logging.Logger:
     external systems handle persistence and rotation.
 
     The function is idempotent: calling it multiple times will not duplicate handlers.
+    Handlers are attached on the first call only, later calls return the cached
+    instance with its level and enabled state re-applied.
 
     Args:
         name: Logical logger name used across the application modules.
@@ -25,25 +37,27 @@ def setup_logger(name: str = "weather_pipeline") -> logging.Logger:
         - ISO-like timestamps: machine parsable and human readable
         - No global basicConfig(): avoids interfering with libraries
     """
-    logger = logging.getLogger(name)
+    # Already configured: skip the logging module lookup (global lock) and the handler setup below
+    logger = _LOGGERS.get(name)
+    if logger is None:
+        logger = logging.getLogger(name)
 
-    # Set level every time to guarantee deterministic behavior even if another module configured logging earlier
+    # Re-applied on every call (cheap attribute sets) to guarantee deterministic behavior even if other code
+    # configured logging in between, e.g. dictConfig(disable_existing_loggers=True) disables existing loggers
     logger.setLevel(logging.INFO)
+    logger.disabled = False
+
+    if name in _LOGGERS:
+        return logger
 
     # Prevent duplicate handlers when modules import setup_logger multiple times. Without this, each import would multiply log lines
     if not logger.handlers:
         handler = logging.StreamHandler(sys.stdout)
-
-        # Format intentionally simple, parse this reliably without custom rules
-        formatter = logging.Formatter(
-            fmt="%(asctime)s - %(levelname)s - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S"
-        )
-
-        handler.setFormatter(formatter)
+        handler.setFormatter(_FORMATTER)
         logger.addHandler(handler)
 
         # Avoid propagation to root logger → prevents duplicate logs if the runtime environment configures logging globally
         logger.propagate = False
 
+    _LOGGERS[name] = logger
     return logger
@@ -1,4 +1,5 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
 from src.api_client import OpenWeatherClient # Handles API communication
@@ -26,11 +27,15 @@ logger = setup_logger()
 # -------------------------------
 print("\nValidating cities in YAML config...\n")
 
-invalid_cities = [
-    f"{c['country'].upper()}.{c['name']}"
-    for c in config["cities"]
-    if not config_loader.validate_city(c["name"], c["country"])
-]
+# Single validation pass: each city is normalized and checked once, then routed to the valid or invalid list
+valid_cities_list = []
+invalid_cities = []
+
+for c in config["cities"]:
+    if config_loader.validate_city(c["name"], c["country"]):
+        valid_cities_list.append(c)
+    else:
+        invalid_cities.append(f"{c['country'].upper()}.{c['name']}")
 
 if invalid_cities:
     print("⚠️ The following cities are invalid (not in OpenWeather list):")
@@ -42,12 +47,6 @@ if invalid_cities:
 else:
     print("✅ All cities in config.yaml are valid according to OpenWeather city list.\n")
 
-# Only process valid cities
-valid_cities_list = [
-    c for c in config["cities"]
-    if config_loader.validate_city(c["name"], c["country"])
-]
-
 # -------------------------------
 # Initialize OpenWeather API client
 # -------------------------------
@@ -55,14 +54,20 @@ api_key = os.environ.get("OPENWEATHER_API_KEY")
 if not api_key:
     raise RuntimeError("OPENWEATHER_API_KEY environment variable is not set")
 
+# Optional settings, defaults keep older config.yaml files working
+max_concurrent = config["api"].get("max_concurrent", 8)
+
 client = OpenWeatherClient(
-    base_url        = config["api"]["base_url"],
-    api_key         = api_key,
-    units           = config["api"]["units"],
-    timeout         = config["api"]["timeout_seconds"],
-    max_retries     = config["api"]["max_retries"],
-    backoff_seconds = config["api"]["backoff_seconds"],
-    logger          = logger
+    base_url             = config["api"]["base_url"],
+    api_key              = api_key,
+    units                = config["api"]["units"],
+    timeout              = config["api"]["timeout_seconds"],
+    max_retries          = config["api"]["max_retries"],
+    backoff_seconds      = config["api"]["backoff_seconds"],
+    max_backoff_seconds  = config["api"].get("max_backoff_seconds", 60),
+    max_concurrent       = max_concurrent,
+    max_calls_per_minute = config["api"].get("max_calls_per_minute", 60),
+    logger               = logger
 )
 
 # -------------------------------
@@ -73,48 +78,87 @@ failed_cities_count = 0
 failed_cities = []
 records = []
 
+
+# WeatherRecord fields that need a type conversion after extraction
+_DATETIME_FIELDS = ("timestamp", "sunrise", "sunset")
+_FLOAT_FIELDS = ("temperature_min", "temperature_max", "temperature_current", "temperature_feels_like", "wind_speed")
+_INT_FIELDS = ("timezone_offset", "cloudiness", "wind_direction_deg", "humidity", "pressure")
+
+
+def _to_int(name: str, value) -> int:
+    """
+    Coerce a field to int like pydantic's lax mode: integral numbers (or numeric strings) only.
+
+    Raises:
+        ValueError: If the value has a fractional part.
+        TypeError: If the value is not a number.
+    """
+    as_int = int(value)
+    if as_int != float(value):
+        raise ValueError(f"{name} is not an integer: {value!r}")
+
+    return as_int
+
+
+def process_city(city_name: str, country_code: str) -> WeatherRecord:
+    """
+    Fetch and model the current weather of a single city.
+
+    Runs inside a worker thread, exceptions are propagated to the caller
+    through the future so the failure is accounted for in the summary.
+    """
+    raw = client.fetch_weather(city_name, country_code)
+
+    # Missing fields default to None
+    fields = client.extract_fields(raw)
+
+    # Validation is skipped below, so apply the coercions pydantic used to do: epoch seconds -> UTC datetimes,
+    # JSON integers -> floats (keeps column types stable across cities, e.g. a temperature of exactly 20),
+    # integral checks on int fields. A bad value raises here and only fails this city
+    for name in _DATETIME_FIELDS:
+        fields[name] = datetime.fromtimestamp(fields[name], tz = timezone.utc)
+
+    for name in _FLOAT_FIELDS:
+        if fields[name] is not None:
+            fields[name] = float(fields[name])
+
+    for name in _INT_FIELDS:
+        if fields[name] is not None:
+            fields[name] = _to_int(name, fields[name])
+
+    # The payload comes from a trusted API and is shaped above, model_construct avoids a full validation pass per record
+    return WeatherRecord.model_construct(
+        city    = city_name,
+        country = country_code,
+        units   = client.units,
+        **fields
+    )
+
+
 print("Starting weather ingestion pipeline...\n")
 
-for city_info in valid_cities_list:
-    city_name   = city_info["name"]
-    country_code = city_info["country"].upper()
-
-    print(f"Fetching weather for {city_name}, {country_code}...")
-
-    try:
-        raw = client.fetch_weather(city_name, country_code)
-
-        # Default values for missing fields
-        default_none = None
-
-        record = WeatherRecord(
-            city                   = city_name,
-            country                = country_code,
-            timestamp              = datetime.fromtimestamp(client.get_field(raw, "dt", default = default_none), tz = timezone.utc),
-            timezone_offset        = client.get_field(raw, "timezone", default = default_none),
-            weather                = client.get_field(raw, "weather", 0, "main", default = default_none),
-            weather_description    = client.get_field(raw, "weather", 0, "description", default = default_none),
-            temperature_min        = client.get_field(raw, "main", "temp_min", default = default_none),
-            temperature_max        = client.get_field(raw, "main", "temp_max", default = default_none),
-            temperature_current    = client.get_field(raw, "main", "temp", default = default_none),
-            temperature_feels_like = client.get_field(raw, "main", "feels_like", default = default_none),
-            cloudiness             = client.get_field(raw, "clouds", "all", default = default_none),
-            wind_speed             = client.get_field(raw, "wind", "speed", default = default_none),
-            wind_direction_deg     = client.get_field(raw, "wind", "deg", default = default_none),
-            humidity               = client.get_field(raw, "main", "humidity", default = default_none),
-            pressure               = client.get_field(raw, "main", "pressure", default = default_none),
-            sunrise                = datetime.fromtimestamp(client.get_field(raw, "sys", "sunrise", default = default_none), tz = timezone.utc),
-            sunset                 = datetime.fromtimestamp(client.get_field(raw, "sys", "sunset", default = default_none), tz = timezone.utc),
-            units                  = client.units
-        )
-
-        records.append(record)
-        success_count += 1
-
-    except Exception as e:
-        logger.error(f"Failed processing {city_name}, {country_code}: {e}")
-        failed_cities.append(f"{country_code}.{city_name}")
-        failed_cities_count += 1
+# Requests are I/O bound, so cities are fetched concurrently. Results are collected in config order to keep output deterministic
+with ThreadPoolExecutor(max_workers = max_concurrent) as executor:
+    futures = []
+    for city_info in valid_cities_list:
+        city_name    = city_info["name"]
+        country_code = city_info["country"].upper()
+        # Printed from the main thread: concurrent prints from the workers interleave on the same line
+        print(f"Fetching weather for {city_name}, {country_code}...")
+        futures.append((city_name, country_code, executor.submit(process_city, city_name, country_code)))
+
+    for city_name, country_code, future in futures:
+        try:
+            records.append(future.result())
+            success_count += 1
+
+        except Exception as e:
+            logger.error(f"Failed processing {city_name}, {country_code}: {e}")
+            failed_cities.append(f"{country_code}.{city_name}")
+            failed_cities_count += 1
+
+# All requests are done, release the pooled HTTP connections
+client.close()
 
 # -------------------------------
 # Write to storage
@@ -122,7 +166,8 @@ for city_info in valid_cities_list:
 storage = Storage(
     base_path = config["storage"]["base_path"],
     fmt       = config["storage"]["format"],
-    layout    = config["storage"]["layout"]
+    layout    = config["storage"]["layout"],
+    logger    = logger
 )
 
 storage.write(records)
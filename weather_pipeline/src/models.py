@@ -1,11 +1,73 @@
 from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter, methodcaller
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+
+# Display format of every datetime column
+DATETIME_FORMAT = "%d-%m-%Y %H:%M:%S"
+
+# Unit of each measured field, per OpenWeather unit system ("default" is the API's standard: Kelvin, m/s)
+_UNITS = {
+    unit_system: {
+        "temperature_current": temperature_unit,
+        "temperature_min": temperature_unit,
+        "temperature_max": temperature_unit,
+        "temperature_feels_like": temperature_unit,
+        "wind_speed": wind_unit,
+        "humidity": "%",
+        "cloudiness": "%",
+        "pressure": "hPa",
+    }
+    for unit_system, temperature_unit, wind_unit in (
+        ("metric", "°C", "m/s"),
+        ("imperial", "°F", "mph"),
+        ("default", "K", "m/s"),
+    )
+}
+
+# Single definition of the output columns, in output order: (internal key, header, value accessor).
+# "{unit}" in a header is replaced by the column's unit for the record's unit system
+_COLUMNS = (
+    ("city",                   "City",                            attrgetter("city")),
+    ("country",                "Country",                         attrgetter("country")),
+    ("timestamp",              "Timestamp",                       attrgetter("timestamp")),
+    ("timezone",               "Timezone",                        methodcaller("timezone_str")),
+    ("weather",                "Weather",                         attrgetter("weather")),
+    ("weather_description",    "Weather_Description",             attrgetter("weather_description")),
+    ("cloudiness",             "Cloudiness_({unit})",             attrgetter("cloudiness")),
+    ("temperature_current",    "Temperature_Current_({unit})",    attrgetter("temperature_current")),
+    ("temperature_min",        "Temperature_Min_({unit})",        attrgetter("temperature_min")),
+    ("temperature_max",        "Temperature_Max_({unit})",        attrgetter("temperature_max")),
+    ("temperature_feels_like", "Temperature_Feels_Like_({unit})", attrgetter("temperature_feels_like")),
+    ("wind_speed",             "Wind_Speed_({unit})",             attrgetter("wind_speed")),
+    ("wind_direction",         "Wind_Direction",                  methodcaller("wind_direction_compass")),
+    ("humidity",               "Humidity_({unit})",               attrgetter("humidity")),
+    ("pressure",               "Pressure_({unit})",               attrgetter("pressure")),
+    ("sunrise",                "Sunrise",                         attrgetter("sunrise")),
+    ("sunset",                 "Sunset",                          attrgetter("sunset")),
+)
+_COLUMN_KEYS = tuple(key for key, _, _ in _COLUMNS)
+
+# Columns holding datetimes, written as DATETIME_FORMAT strings
+DATETIME_COLUMNS = ("timestamp", "sunrise", "sunset")
+
+# 16-point compass, clockwise from North, one sector every 22.5°
+_COMPASS_POINTS = (
+    "North", "North-Northeast", "Northeast", "East-Northeast",
+    "East", "East-Southeast", "Southeast", "South-Southeast",
+    "South", "South-Southwest", "Southwest", "West-Southwest",
+    "West", "West-Northwest", "Northwest", "North-Northwest",
+)
 
 class WeatherRecord(BaseModel):
     """
-    Validated weather record with automatic formatting for timestamps,
-    timezone, wind direction, and units.
+    Weather record with automatic formatting for timestamps, timezone,
+    wind direction, and units.
+
+    The pipeline builds records with `model_construct`, which skips pydantic
+    validation: field types are only guaranteed by the coercions done in
+    `process_city` (main.py). Instantiate the model normally to get validation.
     """
     city: Optional[str]
     country: Optional[str]
@@ -28,7 +90,7 @@ class WeatherRecord(BaseModel):
 
     def format_datetime(self, dt: datetime) -> str:
         """Return datetime in 'dd-MM-yyyy HH:mm:ss' format."""
-        return dt.strftime("%d-%m-%Y %H:%M:%S")
+        return dt.strftime(DATETIME_FORMAT)
 
     def timezone_str(self) -> str:
         """Convert seconds offset to UTC string."""
@@ -50,63 +112,69 @@ class WeatherRecord(BaseModel):
         337.5°  -> North-Northwest
         """
 
-        dirs = [
-            "North", "North-Northeast", "Northeast", "East-Northeast",
-            "East", "East-Southeast", "Southeast", "South-Southeast",
-            "South", "South-Southwest", "Southwest", "West-Southwest",
-            "West", "West-Northwest", "Northwest", "North-Northwest"
-        ]
-        # Each sector is 22.5°, divide wind degrees by 22.5 and round to nearest integer
-        ix = round(self.wind_direction_deg / 22.5) % 16
-        return dirs[ix]
+        # Each sector is 22.5° (= 360/16): floor(deg * 16 / 360 + 1/2) rounds to the nearest sector in integer arithmetic,
+        # & 15 wraps 360° back to North. Integer degrees never fall on a tie, so this matches round(deg / 22.5) % 16
+        ix = (int(self.wind_direction_deg * 16 + 180) // 360) & 15
+        return _COMPASS_POINTS[ix]
+
+    def _unit_for(self, field_name: str) -> str:
+        """
+        Return the unit of a field for the unit system in self.units.
+        Unknown unit systems fall back to the API default, fields without a unit return "".
+        """
+        return _UNITS.get(self.units, _UNITS["default"]).get(field_name, "")
 
     def field_with_units(self, field_name: str) -> str: #TODO - check units
         """
         Return a human-readable field value with units, dynamically
         using the unit system specified in self.units (default, metric, imperial).
+        Public display helper, not used by the pipeline itself.
         """
-        # Determine temperature unit based on the API units
-        if "temperature" in field_name:
-            temp_unit = {
-                "metric": "°C",
-                "imperial": "°F",
-                "default": "K"
-            }.get(self.units, "K")
-            unit = temp_unit
-        elif field_name == "wind_speed":
-            unit = "m/s" if self.units in ("metric", "default") else "mph"
-        elif field_name in ["humidity", "cloudiness"]:
-            unit = "%"
-        elif field_name == "pressure":
-            unit = "hPa"
-        else:
-            unit = ""
-
+        unit = self._unit_for(field_name)
         value = getattr(self, field_name)
         return f"{value} {unit}" if unit else str(value)
 
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _header_for(cls, units: Optional[str]) -> Tuple[str, ...]:
+        """
+        Return the output headers for a unit system, aligned with _COLUMN_KEYS.
+        Units are added to the header names. Built once per unit system, then cached.
+        """
+        unit = _UNITS.get(units, _UNITS["default"])
+        return tuple(header.format(unit=unit.get(key, "")) for key, header, _ in _COLUMNS)
+
+    @classmethod
+    def column_headers(cls, units: Optional[str]) -> Dict[str, str]:
+        """
+        Return the output header of each column, in output order.
+
+        Keys are the column names used internally (record fields, plus the derived
+        "timezone" and "wind_direction"), values are the headers written to disk.
+        Units are added to the header names for the given unit system.
+        """
+        return dict(zip(_COLUMN_KEYS, cls._header_for(units)))
+
+    @staticmethod
+    def column_values(records: List["WeatherRecord"]) -> Dict[str, list]:
+        """
+        Return the values of every output column as one list per column.
+
+        Keys and order match `column_headers`. Columns in DATETIME_COLUMNS are
+        left as datetimes, so the caller can format them in bulk.
+        """
+        return {key: [get(r) for r in records] for key, _, get in _COLUMNS}
+
     def formatted_record(self) -> dict:
         """
         Return a dictionary suitable for CSV or display.
         Units are added to the **header names**, values remain numeric.
-        """
-        return {
-            "City": self.city,
-            "Country": self.country,
-            "Timestamp": self.format_datetime(self.timestamp),
-            "Timezone": self.timezone_str(),
-            "Weather": self.weather,
-            "Weather_Description": self.weather_description,
-            "Cloudiness_(%)": self.cloudiness,
-            f"Temperature_Current_({self.field_with_units('temperature_current').split()[-1]})": self.temperature_current,
-            f"Temperature_Min_({self.field_with_units('temperature_min').split()[-1]})": self.temperature_min,
-            f"Temperature_Max_({self.field_with_units('temperature_max').split()[-1]})": self.temperature_max,
-            f"Temperature_Feels_Like_({self.field_with_units('temperature_feels_like').split()[-1]})": self.temperature_feels_like,
-            f"Wind_Speed_({self.field_with_units('wind_speed').split()[-1]})": self.wind_speed,
-            "Wind_Direction": self.wind_direction_compass(),
-            "Humidity_(%)": self.humidity,
-            "Pressure_(hPa)": self.pressure,
-            "Sunrise": self.format_datetime(self.sunrise),
-            "Sunset": self.format_datetime(self.sunset),
-        }
 
+        Public helper for inspecting a single record, the pipeline itself writes
+        through `column_values`. Both read the same column table, so they always agree.
+        """
+        values = []
+        for key, _, get in _COLUMNS:
+            value = get(self)
+            values.append(self.format_datetime(value) if key in DATETIME_COLUMNS else value)
+        return dict(zip(self._header_for(self.units), values))
@@ -1,9 +1,20 @@
+import os
+import orjson
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pathlib import Path
-from typing import List
-from src.models import WeatherRecord
+from typing import Dict, List, Optional
+from src.models import DATETIME_COLUMNS, DATETIME_FORMAT, WeatherRecord
 from datetime import datetime, timezone
 
+# Compact Parquet types of the bounded integer columns (percentages 0-100, pressure in hPa), keyed like WeatherRecord.column_headers
+_PARQUET_DOWNCASTS = {
+    "cloudiness": pa.uint8(),
+    "humidity": pa.uint8(),
+    "pressure": pa.int16(),
+}
 
 class Storage:
     """
@@ -13,7 +24,7 @@ class Storage:
     multiple folder layout options for Hive-style partitioning.
     """
 
-    def __init__(self, base_path: str, fmt: str, layout: str):
+    def __init__(self, base_path: str, fmt: str, layout: str, logger):
         """
         Initialize storage.
 
@@ -26,22 +37,97 @@ class Storage:
                 - country_date: country/year/month/day/weather_timestamp
                 - hive_compact: year/month/day/country/city_weather_timestamp
                 - city_date: city/year/month/day/weather_timestamp
+            logger: Preconfigured application logger.
         """
         self.base_path = Path(base_path)
         self.fmt = fmt.lower()
         self.layout = layout.lower()
+        self.logger = logger
+
+    @staticmethod
+    def _save_parquet(table: pa.Table, filepath: Path) -> None:
+        """Save an Arrow table to disk as Parquet."""
+        # Zstd compresses this schema (mostly repeated strings and small numbers) noticeably better than the default Snappy,
+        # dictionary encoding covers the low-cardinality text columns (City, Country, Weather, Wind_Direction)
+        pq.write_table(
+            table,
+            filepath,
+            compression="zstd",
+            compression_level=3,
+            use_dictionary=True,
+            data_page_size=1024 * 1024
+        )
 
     def _save(self, df: pd.DataFrame, filepath: Path) -> None:
-        """Save a DataFrame to disk in the configured format."""
-        if self.fmt == "parquet":
-            df.to_parquet(filepath, index=False)
-        elif self.fmt == "csv":
+        """Save a DataFrame to disk in the configured text format (CSV or JSON Lines)."""
+        if self.fmt == "csv":
             df.to_csv(filepath, index=False)
         elif self.fmt == "json":
-            df.to_json(filepath, orient="records", lines=True)
+            # JSON Lines encoded with orjson, rows are zipped straight from the column lists (no per-row dict from to_dict).
+            # tolist() yields native Python values, NaN/None are written as null
+            columns = list(df.columns)
+            rows = zip(*(df[column].tolist() for column in columns))
+            with open(filepath, "wb") as f:
+                f.writelines(orjson.dumps(dict(zip(columns, row))) + b"\n" for row in rows)
         else:
             raise ValueError(f"Unsupported format: {self.fmt}")
 
+    def _save_partition(self, group: pd.DataFrame, filepath: Path, table: Optional[pa.Table]) -> None:
+        """
+        Save one partition of the run.
+
+        For Parquet, `table` holds the whole run already converted to Arrow and
+        the partition's rows are sliced from it by position, without copying the
+        pandas group. Other formats write the group itself, minus the hidden `_ts` column.
+        """
+        if table is not None:
+            self._save_parquet(table.take(group.index.to_numpy()), filepath)
+        else:
+            self._save(group.drop(columns=["_ts"]), filepath)
+
+    def _drop_out_of_range(self, df: pd.DataFrame, types: Dict[str, pa.DataType]) -> pd.DataFrame:
+        """
+        Drop, and log, the rows whose values do not fit the given integer types.
+
+        Used before `_downcast` so a single bad city is skipped instead of the
+        checked cast aborting the write for every city of the run.
+        """
+        in_range = pd.Series(True, index=df.index)
+        for name, data_type in types.items():
+            limits = np.iinfo(data_type.to_pandas_dtype())
+            in_range &= df[name].isna() | df[name].between(limits.min, limits.max)
+
+        for city, country in zip(df.loc[~in_range, "City"], df.loc[~in_range, "Country"]):
+            self.logger.error(f"Skipping {city}, {country}: value out of range for Parquet storage")
+
+        return df[in_range].reset_index(drop=True)
+
+    @staticmethod
+    def _downcast(table: pa.Table, types: Dict[str, pa.DataType]) -> pa.Table:
+        """
+        Cast the given columns of an Arrow table to smaller types.
+
+        The cast is checked: a value that does not fit the new type raises
+        instead of being silently truncated.
+        """
+        schema = table.schema
+        for name, data_type in types.items():
+            index = schema.get_field_index(name)
+            schema = schema.set(index, schema.field(index).with_type(data_type))
+        return table.cast(schema)
+
+    @staticmethod
+    def _makedirs(path: Path, seen_dirs: set) -> None:
+        """Create a partition folder, at most once per write() call (saves repeated stat calls on deep paths)."""
+        if path not in seen_dirs:
+            os.makedirs(path, exist_ok=True)
+            seen_dirs.add(path)
+
+    @staticmethod
+    def _format_datetimes(values: List[datetime]) -> pd.Index:
+        """Format a column of UTC datetimes to display strings in one vectorized pass."""
+        return pd.to_datetime(values, utc=True).strftime(DATETIME_FORMAT)
+
     def write(self, records: List[WeatherRecord]) -> None:
         """
         Write weather records to disk using the configured format and layout.
@@ -52,13 +138,30 @@ class Storage:
         if not records:
             return
 
-        # Convert records to dicts
-        data = [r.formatted_record() for r in records]
-        df = pd.DataFrame(data)
+        # Build the DataFrame column by column (one list per column) instead of one dict per record,
+        # pandas then allocates each column in a single shot. Columns, their order and headers all come
+        # from the model's column table. All records of a run come from the same client, so they share one unit system
+        headers = WeatherRecord.column_headers(records[0].units)
+        columns = WeatherRecord.column_values(records)
+        timestamps = pd.to_datetime(columns["timestamp"], utc=True)
+        for key in DATETIME_COLUMNS:
+            columns[key] = self._format_datetimes(columns[key])
+        df = pd.DataFrame({headers[key]: values for key, values in columns.items()})
+
+        # Keep the real datetimes for partitioning in a hidden column, next to the display string
+        df["_ts"] = timestamps
+        df = df.dropna(subset=["_ts"]).reset_index(drop=True)
+
+        # Parquet: convert the whole run to Arrow once (single schema inference and conversion), partitions are sliced from it.
+        # Bounded integer columns are stored with the smallest type that fits them, rows that don't fit are skipped first
+        table = None
+        if self.fmt == "parquet":
+            downcasts = {headers[key]: data_type for key, data_type in _PARQUET_DOWNCASTS.items()}
+            df = self._drop_out_of_range(df, downcasts)
+            table = self._downcast(pa.Table.from_pandas(df.drop(columns=["_ts"]), preserve_index=False), downcasts)
 
-        # Preserve display column
-        df["_ts"] = pd.to_datetime(df["Timestamp"], format="%d-%m-%Y %H:%M:%S", errors="coerce")
-        df = df.dropna(subset=["_ts"])
+        # Partition folders already created during this write
+        seen_dirs = set()
 
         run_ts = datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')
 
@@ -66,40 +169,37 @@ class Storage:
         if self.layout == "date":
             for date, group in df.groupby(df["_ts"].dt.date):
                 path = self.base_path / f"year={date.year}/month={date.month}/day={date.day}"
-                path.mkdir(parents=True, exist_ok=True)
+                self._makedirs(path, seen_dirs)
                 filename = f"weather_{run_ts}.{self.fmt}"
-                self._save(group.drop(columns=["_ts"]), path / filename)
+                self._save_partition(group, path / filename, table)
 
         elif self.layout == "date_country":
             for (date, country), group in df.groupby([df["_ts"].dt.date, "Country"]):
                 path = self.base_path / f"year={date.year}/month={date.month}/day={date.day}"
-                path.mkdir(parents=True, exist_ok=True)
+                self._makedirs(path, seen_dirs)
                 filename = f"{country}_weather_{run_ts}.{self.fmt}"
-                self._save(group.drop(columns=["_ts"]), path / filename)
+                self._save_partition(group, path / filename, table)
 
         elif self.layout == "country_date":
             for (country, date), group in df.groupby([df["Country"], df["_ts"].dt.date]):
                 path = self.base_path / f"{country}/year={date.year}/month={date.month}/day={date.day}"
-                path.mkdir(parents=True, exist_ok=True)
+                self._makedirs(path, seen_dirs)
                 filename = f"weather_{run_ts}.{self.fmt}"
-                self._save(group.drop(columns=["_ts"]), path / filename)
+                self._save_partition(group, path / filename, table)
 
         elif self.layout == "hive_compact":
-            for _, row in df.iterrows():
-                ts = row["_ts"]
-                city = row["City"]
-                country = row["Country"]
-                path = self.base_path / f"year={ts.year}/month={ts.month}/day={ts.day}/{country}/{city}"
-                path.mkdir(parents=True, exist_ok=True)
+            for (date, country, city), group in df.groupby([df["_ts"].dt.date, "Country", "City"]):
+                path = self.base_path / f"year={date.year}/month={date.month}/day={date.day}/{country}/{city}"
+                self._makedirs(path, seen_dirs)
                 filename = f"{country}_{city}_{run_ts}.{self.fmt}"
-                self._save(pd.DataFrame([row]).drop(columns=["_ts"]), path / filename)
+                self._save_partition(group, path / filename, table)
 
         elif self.layout == "city_date":
             for (city, date), group in df.groupby([df["City"], df["_ts"].dt.date]):
                 path = self.base_path / f"{city}/year={date.year}/month={date.month}/day={date.day}"
-                path.mkdir(parents=True, exist_ok=True)
+                self._makedirs(path, seen_dirs)
                 filename = f"weather_{run_ts}.{self.fmt}"
-                self._save(group.drop(columns=["_ts"]), path / filename)
+                self._save_partition(group, path / filename, table)
 
         else:
             raise ValueError(f"Unsupported layout: {self.layout}")